@@ -14,13 +14,23 @@ class ColoredFormatter(logging.Formatter):
         "RESET": "\033[0m",  # Reset color
     }
 
-    def format(self, record: logging.LogRecord):
-        log_message = super().format(record)
-        level_color = self.COLORS.get(record.levelname, self.COLORS["RESET"])
-        reset_color = self.COLORS["RESET"]
-        colored_message = f"{level_color}{log_message}{reset_color}"
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._reset = self.COLORS["RESET"]
+        self._prefix = {
+            logging.DEBUG: self.COLORS["DEBUG"],
+            logging.INFO: self.COLORS["INFO"],
+            logging.WARNING: self.COLORS["WARNING"],
+            logging.ERROR: self.COLORS["ERROR"],
+            logging.CRITICAL: self.COLORS["CRITICAL"],
+        }
 
-        return colored_message
+    def format(self, record: logging.LogRecord):
+        return (
+            self._prefix.get(record.levelno, self._reset)
+            + super().format(record)
+            + self._reset
+        )
 
 
 def setup_colored_logger(
@@ -44,7 +54,10 @@ def setup_colored_logger(
     logger.setLevel(level)
 
     if logger.handlers:
-        logger.handlers.clear()
+        # Already configured: only refresh the level, keep the handler
+        for handler in logger.handlers:
+            handler.setLevel(level)
+        return logger
 
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(level)
@@ -54,5 +67,6 @@ def setup_colored_logger(
     )
     console_handler.setFormatter(formatter)
     logger.addHandler(console_handler)
+    logger.propagate = False
 
     return logger
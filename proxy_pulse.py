@@ -1,29 +1,44 @@
-import re
 import asyncio
+import logging
 import argparse
 from enum import Enum
-from typing import List, Awaitable, Any
+from typing import List, Awaitable, Any, Iterable
 import aiohttp
 import aiohttp_socks
 from logger import setup_colored_logger
 
 
 from rich.console import Console
+from rich.style import Style
 from rich.table import Table
 
 
+_PROXY_LOGGER = setup_colored_logger("Proxy")
+
+
 class ProxyType(Enum):
     HTTP = "HTTP"
     SOCKS5 = "SOCKS5"
 
 
+_HTTP_NAME = ProxyType.HTTP.name
+_SOCKS5_NAME = ProxyType.SOCKS5.name
+
+
 class ProxyTableDisplay:
     COLUMNS = ["host", "port", "login", "password", "http", "socks5"]
+    _EMOJI = ("❌", "✅")
+    _UNCHECKED = "-"
+    _ROW_STYLE = Style.parse("bright_green")
 
     def __init__(self) -> None:
         self.console = Console()
 
-    def create_table(self, proxies: list["Proxy"]) -> Table:
+    def create_table(
+        self, proxies: list["Proxy"], protocols: list[str] | None = None
+    ) -> Table:
+        check_http = protocols is None or "http" in protocols
+        check_socks5 = protocols is None or "socks5" in protocols
         table = Table(title="Proxies")
         for column in self.COLUMNS:
             table.add_column(
@@ -34,62 +49,112 @@ class ProxyTableDisplay:
                 justify="center",
             )
         for proxy in proxies:
-            proxy_data = [
+            table.add_row(
                 proxy.host,
-                str(proxy.port),
+                proxy.port_str,
                 proxy.login,
                 proxy.password,
-                "✅" if proxy.http else "❌",
-                "✅" if proxy.socks5 else "❌",
-            ]
-            table.add_row(*proxy_data, style="bright_green")
+                (
+                    self._EMOJI[bool(proxy.http)]
+                    if check_http
+                    else self._UNCHECKED
+                ),
+                (
+                    self._EMOJI[bool(proxy.socks5)]
+                    if check_socks5
+                    else self._UNCHECKED
+                ),
+                style=self._ROW_STYLE,
+            )
         return table
 
-    def display_proxies(self, proxies: list["Proxy"]) -> None:
-        """Displays the proxy data in a formatted table"""
-        table = self.create_table(proxies)
+    def display_proxies(
+        self, proxies: list["Proxy"], protocols: list[str] | None = None
+    ) -> None:
+        """Displays the proxy data in a formatted table
+
+        Args:
+            proxies (list[Proxy]): Proxies to display
+            protocols (list[str] | None): Checked protocols, unchecked ones
+                are shown as '-'. All protocols if None
+        """
+        table = self.create_table(proxies, protocols)
         self.console.print(table)
 
 
 class _ProxyConnector:
+    __slots__ = (
+        "_http_connector",
+        "_socks5_connector",
+        "host",
+        "port",
+        "login",
+        "password",
+    )
+
     def __init__(self) -> None:
-        self.http_connector: "aiohttp_socks.ProxyConnector" = None
-        self.socks5_connector: "aiohttp_socks.ProxyConnector" = None
+        self._http_connector: "aiohttp_socks.ProxyConnector | None" = None
+        self._socks5_connector: "aiohttp_socks.ProxyConnector | None" = None
 
         self.host: str = ""
         self.port: int = 0
         self.login: str = ""
         self.password: str = ""
 
-    def connector(self):
-        """Initialize SOCKS5 and HTTP proxy connectors with authentication"""
+    def connector(
+        self, proxy_type: "aiohttp_socks.ProxyType"
+    ) -> "aiohttp_socks.ProxyConnector | None":
+        """Create proxy connector with authentication for the protocol
+
+        Args:
+            proxy_type (aiohttp_socks.ProxyType): Proxy protocol type
+
+        Returns:
+            aiohttp_socks.ProxyConnector | None: Proxy connector,
+                None if host or port is missing
+        """
         if self.host and self.port:
-            self.socks5_connector = aiohttp_socks.ProxyConnector(
+            return aiohttp_socks.ProxyConnector(
                 host=self.host,
                 port=self.port,
                 username=self.login,
                 password=self.password,
-                proxy_type=aiohttp_socks.ProxyType.SOCKS5,
+                proxy_type=proxy_type,
+                # One-shot probe: no keepalive, concurrency is bounded
+                # by the caller
+                force_close=True,
+                limit=0,
             )
-            self.http_connector = aiohttp_socks.ProxyConnector(
-                host=self.host,
-                port=self.port,
-                username=self.login,
-                password=self.password,
-                proxy_type=aiohttp_socks.ProxyType.HTTP,
+        return None
+
+    @property
+    def socks5_connector(self) -> "aiohttp_socks.ProxyConnector | None":
+        """SOCKS5 proxy connector, created on first access"""
+        if self._socks5_connector is None:
+            self._socks5_connector = self.connector(
+                aiohttp_socks.ProxyType.SOCKS5
             )
+        return self._socks5_connector
+
+    @property
+    def http_connector(self) -> "aiohttp_socks.ProxyConnector | None":
+        """HTTP proxy connector, created on first access"""
+        if self._http_connector is None:
+            self._http_connector = self.connector(aiohttp_socks.ProxyType.HTTP)
+        return self._http_connector
 
 
 class Proxy(_ProxyConnector):
+    __slots__ = ("logger", "http", "socks5", "auth", "port_str")
+
     def __init__(self, proxy: str) -> None:
         super().__init__()
-        self.logger = setup_colored_logger("Proxy")
+        self.logger = _PROXY_LOGGER
         self.normalize_proxy(proxy)
-        self.connector()
+        self.port_str: str = str(self.port)
 
         self.http: bool = False
         self.socks5: bool = False
-        self.proxy_types = []
         self.auth = False
         if self.login and self.password:
             self.auth = True
@@ -112,24 +177,44 @@ class Proxy(_ProxyConnector):
         Note:
             Parses and sets the proxy attributes
         """
-        elements: list[Any] = proxy.replace("@", ":").split(":")
+        if "@" in proxy:
+            # login:password@host:port
+            auth, _, address = proxy.rpartition("@")
+            login, sep, password = auth.partition(":")
+            host, _, port = address.rpartition(":")
+            if not port.isdecimal():
+                # host:port@login:password
+                host, _, port = auth.rpartition(":")
+                login, sep, password = address.partition(":")
+            if sep and host and port.isdecimal():
+                self.login, self.password = login, password
+                self.host, self.port = host, port
+                self.logger.debug("proxy format passed: %s", proxy)
+            else:
+                self.logger.warning("proxy format failed: '%s'", proxy)
+            return
+
+        elements: list[Any] = proxy.split(":")
         if len(elements) == 4:
-            if re.match(r"\d+$", elements[-1]):
+            if elements[-1].isdecimal():
                 self.login, self.password, self.host, self.port = elements
-                self.logger.debug(f"proxy format passed: {proxy}")
-            elif re.match(r"\d+$", elements[1]):
+                self.logger.debug("proxy format passed: %s", proxy)
+            elif elements[1].isdecimal():
                 self.host, self.port, self.login, self.password = elements
-                self.logger.debug(f"proxy format passed: {proxy}")
+                self.logger.debug("proxy format passed: %s", proxy)
             else:
-                self.logger.warning(f"proxy format failed: '{proxy}'")
-        elif len == 2:
-            pass
+                self.logger.warning("proxy format failed: '%s'", proxy)
+        elif len(elements) == 2 and elements[1].isdecimal():
+            self.host, self.port = elements
+            self.logger.debug("proxy format passed: %s", proxy)
         else:
-            self.logger.warning(f"proxy format failed: '{proxy}'")
+            self.logger.warning("proxy format failed: '%s'", proxy)
 
 
 class ProxyPulse:
     _URL: str = "https://httpbin.org/ip"
+    _TIMEOUT: "aiohttp.ClientTimeout" = aiohttp.ClientTimeout(total=5)
+    _READ_BUFSIZE: int = 4 * 1024 * 1024
 
     def __init__(self, args: "argparse.Namespace") -> None:
         self.proxies: list["Proxy"] = []
@@ -138,16 +223,16 @@ class ProxyPulse:
             name="ProxyPulse", debug=self.args.debug
         )
 
-    def parse_proxies_file(self, data: str) -> None:
+    def parse_proxies_file(self, rows: Iterable[str]) -> None:
         """Parse proxy addresses from text and create Proxy objects for each one
 
         Args:
-            data (str): Raw proxy data text with one proxy per line.
+            rows (Iterable[str]): Proxy data lines (e.g. an open file),
+                one or more whitespace-separated proxies per line.
         """
-        for row in data.splitlines():
-            if row.strip():
-                for line in row.split():
-                    self.proxies.append(Proxy(line))
+        for row in rows:
+            for line in row.split():
+                self.proxies.append(Proxy(line))
 
     def parse_proxies(self):
         """Parse proxy configurations from command-line arguments
@@ -163,8 +248,7 @@ class ProxyPulse:
             if self.args.file:
                 try:
                     with open(self.args.file, "r", encoding="utf-8") as readf:
-                        data = readf.read()
-                        self.parse_proxies_file(data)
+                        self.parse_proxies_file(readf)
                 except FileNotFoundError as err:
                     self.logger.error(err)
                 except IOError as err:
@@ -178,10 +262,10 @@ class ProxyPulse:
             str: _description_
         """
         if self.args.url:
-            self.logger.debug(f"using URL from args: '{self.args.url}'")
+            self.logger.debug("using URL from args: '%s'", self.args.url)
             return self.args.url
         else:
-            self.logger.debug(f"using default URL: '{self._URL}'")
+            self.logger.debug("using default URL: '%s'", self._URL)
             return self._URL
 
     def _is_valid_proxy(self, proxy: "Proxy") -> bool:
@@ -194,7 +278,7 @@ class ProxyPulse:
             bool: True if valid, False otherwise
         """
         if not proxy.host and proxy.port:
-            self.logger.error(f"invalid proxy: '{proxy}'")
+            self.logger.error("invalid proxy: '%s'", proxy)
             return False
         return True
 
@@ -210,9 +294,7 @@ class ProxyPulse:
         Returns:
             ProxyType | None: Available proxy protocol, None otherwise
         """
-        if connector._proxy_type.name in ProxyType._member_names_:
-            return ProxyType[connector._proxy_type.name]
-        return None
+        return ProxyType.__members__.get(connector._proxy_type.name)
 
     def _proxy_status(
         self, proxy: "Proxy", proxy_type: str, status_code: int | None
@@ -227,16 +309,16 @@ class ProxyPulse:
                 None if check failed
         """
         if status_code in [200, 204]:
-            if proxy_type == ProxyType.HTTP.name:
+            if proxy_type == _HTTP_NAME:
                 proxy.http = True
-            if proxy_type == ProxyType.SOCKS5.name:
+            if proxy_type == _SOCKS5_NAME:
                 proxy.socks5 = True
             self.logger.debug(
-                f"{proxy_type.lower()} proxy protocol type is available"
+                "%s proxy protocol type is available", proxy_type.lower()
             )
         else:
             self.logger.warning(
-                f"{proxy_type.lower()} proxy protocol type is not available"
+                "%s proxy protocol type is not available", proxy_type.lower()
             )
 
     async def _execute_request(
@@ -257,41 +339,57 @@ class ProxyPulse:
             int | None: status code, None otherwise
         """
 
-        self.logger.debug(
-            f"try request {proxy_type.name.lower()} proxy: '{proxy}'"
-        )
-        async with aiohttp.ClientSession(connector=connector) as client:
+        dbg = self.logger.isEnabledFor(logging.DEBUG)
+        if dbg:
+            self.logger.debug(
+                "try request %s proxy: '%s'", proxy_type.name.lower(), proxy
+            )
+        async with aiohttp.ClientSession(
+            connector=connector,
+            timeout=self._TIMEOUT,
+            read_bufsize=self._READ_BUFSIZE,
+            cookie_jar=aiohttp.DummyCookieJar(),
+        ) as client:
             try:
-                self.logger.debug(connector)
+                if dbg:
+                    self.logger.debug(connector)
 
-                async with client.get(
-                    url=self.url,
-                    timeout=aiohttp.ClientTimeout(total=5),
-                ) as resp:
+                async with client.get(url=self.url) as resp:
+                    # Only the status matters, don't wait for the body
+                    resp.release()
                     if resp and resp.status in [200, 204]:
-                        self.logger.debug(
-                            f"success with {proxy_type.name.lower()} "
-                            f"proxy: '{proxy}': code: {resp.status}"
-                        )
+                        if dbg:
+                            self.logger.debug(
+                                "success with %s proxy: '%s': code: %s",
+                                proxy_type.name.lower(),
+                                proxy,
+                                resp.status,
+                            )
                         return resp.status
                     else:
                         self.logger.warning(
-                            f"Failed with proxy: '{proxy}': {resp}"
+                            "Failed with proxy: '%s': %s", proxy, resp
                         )
             except aiohttp_socks.ProxyError as err:
                 self.logger.warning(
-                    f"problem with {proxy_type.name.lower()} "
-                    f"proxy: {proxy}, {err.args}"
+                    "problem with %s proxy: %s, %s",
+                    proxy_type.name.lower(),
+                    proxy,
+                    err.args,
                 )
             except aiohttp_socks.ProxyConnectionError as err:
                 self.logger.warning(
-                    f"problem with connection to {proxy_type.name.lower()} "
-                    f"proxy '{proxy}', {err.args}"
+                    "problem with connection to %s proxy '%s', %s",
+                    proxy_type.name.lower(),
+                    proxy,
+                    err.args,
                 )
             except Exception as err:
                 self.logger.warning(
-                    f"failed with {proxy_type.name.lower()} "
-                    f"proxy '{proxy}': {err}"
+                    "failed with %s proxy '%s': %s",
+                    proxy_type.name.lower(),
+                    proxy,
+                    err,
                 )
 
         return None
@@ -318,6 +416,43 @@ class ProxyPulse:
         result = await self._execute_request(proxy, connector, proxy_type)
         self._proxy_status(proxy, proxy_type.name, result)
 
+    async def check_proxy(self, proxy: "Proxy", protocols: list[str]) -> None:
+        """Check the requested protocols of a proxy concurrently
+
+        Args:
+            proxy (Proxy): Proxy instance
+            protocols (list[str]): Protocols to check (e.g. 'http', 'socks5')
+        """
+        requests: List[Awaitable[Any]] = []
+        if "http" in protocols:
+            requests.append(self.make_request(proxy, proxy.http_connector))
+        if "socks5" in protocols:
+            requests.append(self.make_request(proxy, proxy.socks5_connector))
+        await asyncio.gather(*requests, return_exceptions=True)
+
+
+def _positive_int(value: str) -> int:
+    """Parse a strictly positive integer command-line value
+
+    Args:
+        value (str): Raw argument value
+
+    Raises:
+        argparse.ArgumentTypeError: If value is not an integer above zero
+
+    Returns:
+        int: Parsed value
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            f"must be a positive integer: '{value}'"
+        )
+    return number
+
 
 async def main():
     try:
@@ -334,6 +469,19 @@ async def main():
             "--url",
             help="URL to test proxy connectivity",
         )
+        argp.add_argument(
+            "--protocols",
+            help="Space-separated proxy protocols to check",
+            nargs="+",
+            choices=["http", "socks5"],
+            default=["http", "socks5"],
+        )
+        argp.add_argument(
+            "--concurrency",
+            help="Maximum number of proxies checked at once",
+            type=_positive_int,
+            default=256,
+        )
         argp.add_argument(
             "--debug",
             help="Enable debug logging",
@@ -345,16 +493,28 @@ async def main():
 
     p = ProxyPulse(args)
     p.parse_proxies()
-    tasks: List[Awaitable[Any]] = []
-    for proxy in p.proxies:
-        tasks.append(p.make_request(proxy, proxy.http_connector))
-        tasks.append(p.make_request(proxy, proxy.socks5_connector))
+    sem = asyncio.Semaphore(getattr(args, "concurrency", 256))
+
+    async def _run(coro: Awaitable[Any]) -> Any:
+        async with sem:
+            return await coro
+
+    protocols = getattr(args, "protocols", None) or ["http", "socks5"]
+    tasks: List[Awaitable[Any]] = [
+        _run(p.check_proxy(proxy, protocols)) for proxy in p.proxies
+    ]
     await asyncio.gather(*tasks, return_exceptions=True)
 
     # Console display
     disp = ProxyTableDisplay()
-    disp.display_proxies(p.proxies)
+    disp.display_proxies(p.proxies, protocols)
 
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
     asyncio.run(main())